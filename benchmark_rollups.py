@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Benchmark de Rollups en PostgreSQL
+Compara la latencia de consultas de dashboard sobre las tablas crudas
+(transactions, fraud_alerts) contra los rollups de refresh_rollups.py
+
+El benchmark trabaja en un schema aislado (rollup_bench) creado con
+postgres/init-db.sql, carga datos sintéticos con generate_series y lo elimina
+al terminar (salvo --keep).
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, List
+
+from generate_test_data import MERCHANTS
+from refresh_rollups import RollupRefresher, add_connection_arguments, connect
+
+BENCH_SCHEMA = 'rollup_bench'
+INIT_DB_SQL = Path(__file__).parent / 'postgres' / 'init-db.sql'
+
+FRAUD_TYPES = ['HIGH_VALUE', 'HIGH_FREQUENCY', 'MULTIPLE_LOCATIONS', 'UNUSUAL_TIME', 'VELOCITY_CHECK']
+
+# Consultas de dashboard: (nombre, consulta sobre tablas crudas, consulta sobre rollups)
+DASHBOARD_QUERIES = [
+    (
+        'Volumen por hora de una cuenta (7 días)',
+        """SELECT date_trunc('hour', timestamp) AS hour, COUNT(*), SUM(amount)
+           FROM transactions
+           WHERE account_id = %(account_id)s AND timestamp >= %(since_7d)s
+           GROUP BY 1 ORDER BY 1""",
+        """SELECT bucket_start, transaction_count, total_amount
+           FROM transactions_hourly_by_account
+           WHERE account_id = %(account_id)s AND bucket_start >= %(since_7d)s
+           ORDER BY 1""",
+    ),
+    (
+        'Top 10 comercios por volumen (7 días)',
+        """SELECT merchant_name, COUNT(*), SUM(amount) AS volume
+           FROM transactions
+           WHERE timestamp >= %(since_7d)s
+           GROUP BY 1 ORDER BY volume DESC LIMIT 10""",
+        """SELECT merchant_name, SUM(transaction_count), SUM(total_amount) AS volume
+           FROM transactions_hourly_by_merchant
+           WHERE bucket_start >= %(since_7d)s
+           GROUP BY 1 ORDER BY volume DESC LIMIT 10""",
+    ),
+    (
+        'Top 10 cuentas por monto (30 días)',
+        """SELECT account_id, COUNT(*), SUM(amount) AS volume
+           FROM transactions
+           WHERE timestamp >= %(since_30d)s
+           GROUP BY 1 ORDER BY volume DESC LIMIT 10""",
+        """SELECT account_id, SUM(transaction_count), SUM(total_amount) AS volume
+           FROM transactions_daily_by_account
+           WHERE bucket_start >= %(since_30d)s
+           GROUP BY 1 ORDER BY volume DESC LIMIT 10""",
+    ),
+    (
+        'Volumen diario total (30 días)',
+        """SELECT date_trunc('day', timestamp) AS day, COUNT(*), SUM(amount)
+           FROM transactions
+           WHERE timestamp >= %(since_30d)s
+           GROUP BY 1 ORDER BY 1""",
+        """SELECT bucket_start, SUM(transaction_count), SUM(total_amount)
+           FROM transactions_daily_by_merchant
+           WHERE bucket_start >= %(since_30d)s
+           GROUP BY 1 ORDER BY 1""",
+    ),
+    (
+        'Alertas por hora y tipo (7 días)',
+        """SELECT date_trunc('hour', alert_timestamp) AS hour, fraud_type, COUNT(*)
+           FROM fraud_alerts
+           WHERE alert_timestamp >= %(since_7d)s
+           GROUP BY 1, 2 ORDER BY 1, 2""",
+        """SELECT bucket_start, fraud_type, SUM(alert_count)
+           FROM fraud_alerts_hourly_by_account
+           WHERE bucket_start >= %(since_7d)s
+           GROUP BY 1, 2 ORDER BY 1, 2""",
+    ),
+]
+
+# Comprobaciones para los rollups que ninguna consulta de dashboard lee
+# (las sumas DOUBLE PRECISION se redondean: el orden de suma cambia los últimos bits)
+VERIFY_QUERIES = [
+    (
+        'Alertas diarias por tipo (30 días)',
+        """SELECT date_trunc('day', alert_timestamp) AS day, fraud_type, COUNT(*),
+                  ROUND(SUM(amount)::numeric, 2)
+           FROM fraud_alerts
+           WHERE alert_timestamp >= %(since_30d)s
+           GROUP BY 1, 2 ORDER BY 1, 2""",
+        """SELECT bucket_start, fraud_type, SUM(alert_count), ROUND(SUM(total_amount)::numeric, 2)
+           FROM fraud_alerts_daily_by_account
+           WHERE bucket_start >= %(since_30d)s
+           GROUP BY 1, 2 ORDER BY 1, 2""",
+    ),
+]
+
+
+def create_bench_schema(connection):
+    """Crea el schema de benchmark con las tablas de postgres/init-db.sql"""
+    with connection:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+            cursor.execute(f"CREATE SCHEMA {BENCH_SCHEMA}")
+            cursor.execute(f"SET search_path TO {BENCH_SCHEMA}")
+            cursor.execute(INIT_DB_SQL.read_text(encoding='utf-8'))
+
+
+def load_transactions(connection, num_rows: int, num_accounts: int, days: float,
+                      offset: int = 0, created_lag: str = "random() * INTERVAL '1 minute'"):
+    """Carga transacciones sintéticas repartidas en los últimos `days` días"""
+    with connection:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO transactions (transaction_id, account_id, timestamp, amount, merchant_name,
+                                          transaction_type, latitude, longitude, channel, status, created_at)
+                SELECT 'TXN_' || g,
+                       'ACC_' || lpad((1 + (g * 7919) %% %(accounts)s)::text, 5, '0'),
+                       ts,
+                       round((10 + random() * 4990)::numeric, 2),
+                       (%(merchants)s::text[])[1 + g %% %(num_merchants)s],
+                       'PURCHASE', 40.7128, -74.0060, 'POS', 'APPROVED',
+                       ts + {created_lag}
+                FROM (
+                    SELECT g, LOCALTIMESTAMP - (%(days)s * INTERVAL '1 day') * random() AS ts
+                    FROM generate_series(%(start)s::bigint, %(end)s::bigint) AS g
+                ) AS rows
+                """,
+                {'accounts': num_accounts, 'merchants': MERCHANTS, 'num_merchants': len(MERCHANTS),
+                 'days': days, 'start': offset + 1, 'end': offset + num_rows}
+            )
+
+
+def load_fraud_alerts(connection, num_rows: int, num_accounts: int, days: int):
+    """Carga alertas de fraude sintéticas repartidas en los últimos `days` días"""
+    with connection:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO fraud_alerts (transaction_id, account_id, amount, fraud_type, severity, alert_timestamp)
+                SELECT 'TXN_' || g,
+                       'ACC_' || lpad((1 + (g * 7919) %% %(accounts)s)::text, 5, '0'),
+                       round((10 + random() * 49990)::numeric, 2),
+                       (%(fraud_types)s::text[])[1 + g %% %(num_fraud_types)s],
+                       'HIGH',
+                       LOCALTIMESTAMP - (%(days)s * INTERVAL '1 day') * random()
+                FROM generate_series(1::bigint, %(rows)s::bigint) AS g
+                """,
+                {'accounts': num_accounts, 'fraud_types': FRAUD_TYPES, 'num_fraud_types': len(FRAUD_TYPES),
+                 'days': days, 'rows': num_rows}
+            )
+
+
+def analyze(connection):
+    """Actualiza estadísticas del planificador para todas las tablas del schema"""
+    connection.autocommit = True
+    with connection.cursor() as cursor:
+        # Sin lista de tablas VACUUM recorrería toda la base, no solo el schema de benchmark
+        cursor.execute("SELECT tablename FROM pg_tables WHERE schemaname = %s", (BENCH_SCHEMA,))
+        tables = ', '.join(f'{BENCH_SCHEMA}.{row[0]}' for row in cursor.fetchall())
+        cursor.execute(f"VACUUM ANALYZE {tables}")
+    connection.autocommit = False
+
+
+def time_query(connection, sql: str, params: Dict, repetitions: int) -> float:
+    """Ejecuta una consulta varias veces y devuelve la mediana en milisegundos"""
+    timings = []
+    with connection.cursor() as cursor:
+        for _ in range(repetitions):
+            start = time.perf_counter()
+            cursor.execute(sql, params)
+            cursor.fetchall()
+            timings.append((time.perf_counter() - start) * 1000)
+    connection.rollback()
+    return statistics.median(timings)
+
+
+def timed_refresh(refresher: RollupRefresher) -> float:
+    """Ejecuta un refresco de rollups y devuelve su duración en segundos"""
+    start = time.perf_counter()
+    refresher.refresh()
+    return time.perf_counter() - start
+
+
+def verify_rollups(connection, params: Dict) -> List[str]:
+    """Comprueba que cada consulta sobre rollups devuelve lo mismo que sobre las tablas crudas"""
+    errors = []
+    with connection.cursor() as cursor:
+        for name, raw_sql, rollup_sql in DASHBOARD_QUERIES + VERIFY_QUERIES:
+            cursor.execute(raw_sql, params)
+            raw = cursor.fetchall()
+            cursor.execute(rollup_sql, params)
+            rollup = cursor.fetchall()
+            if not raw or raw != rollup:
+                errors.append(f'{name}: los rollups no coinciden con las tablas crudas')
+    connection.rollback()
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark de consultas de dashboard: tablas crudas vs rollups',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Ejemplos de uso:
+  # 10 millones de transacciones (default)
+  python benchmark_rollups.py
+
+  # Prueba rápida conservando el schema de benchmark
+  python benchmark_rollups.py --rows 100000 --keep
+        """
+    )
+
+    add_connection_arguments(parser)
+
+    parser.add_argument('-r', '--rows', type=int, default=10_000_000,
+                        help='Número de transacciones a cargar (default: 10000000)')
+    parser.add_argument('--accounts', type=int, default=10_000,
+                        help='Número de cuentas distintas (default: 10000)')
+    parser.add_argument('--days', type=int, default=30,
+                        help='Días cubiertos por los datos (default: 30)')
+    parser.add_argument('--fraud-rate', type=float, default=0.02,
+                        help='Alertas de fraude por transacción (default: 0.02)')
+    parser.add_argument('--repetitions', type=int, default=5,
+                        help='Repeticiones por consulta; se reporta la mediana (default: 5)')
+    parser.add_argument('--keep', action='store_true',
+                        help=f'No eliminar el schema {BENCH_SCHEMA} al terminar')
+
+    args = parser.parse_args()
+
+    # Validaciones
+    if args.rows <= 0 or args.accounts <= 0 or args.days <= 0 or args.repetitions <= 0:
+        print("Error: --rows, --accounts, --days y --repetitions deben ser mayores a 0")
+        sys.exit(1)
+
+    if not 0.0 <= args.fraud_rate <= 1.0:
+        print("Error: La tasa de fraude debe estar entre 0.0 y 1.0")
+        sys.exit(1)
+
+    connection = connect(args)
+    batch_rows = max(1, args.rows // 1000)
+
+    try:
+        print(f"\n🚀 Preparando schema {BENCH_SCHEMA}...")
+        create_bench_schema(connection)
+
+        print(f"   Cargando {args.rows:,} transacciones y {int(args.rows * args.fraud_rate):,} alertas...")
+        start = time.perf_counter()
+        load_transactions(connection, args.rows, args.accounts, args.days)
+        load_fraud_alerts(connection, int(args.rows * args.fraud_rate), args.accounts, args.days)
+        analyze(connection)
+        print(f"   Carga completada en {time.perf_counter() - start:.1f} s")
+
+        refresher = RollupRefresher(connection)
+        print(f"\n🔄 Refresco inicial de rollups: {timed_refresh(refresher):.1f} s")
+
+        # Filas nuevas de la última hora, insertadas ahora
+        load_transactions(connection, batch_rows, args.accounts, 1 / 24,
+                          offset=args.rows, created_lag="(LOCALTIMESTAMP - ts)")
+        print(f"🔄 Refresco incremental ({batch_rows:,} filas nuevas): {timed_refresh(refresher):.2f} s")
+
+        # Filas tardías: timestamps de hasta 24 horas atrás que llegan ahora
+        load_transactions(connection, batch_rows, args.accounts, 1,
+                          offset=args.rows + batch_rows, created_lag="(LOCALTIMESTAMP - ts)")
+        print(f"🔄 Refresco incremental ({batch_rows:,} filas tardías): {timed_refresh(refresher):.2f} s")
+        analyze(connection)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT MAX(timestamp), (SELECT account_id FROM transactions LIMIT 1) FROM transactions"
+            )
+            last_timestamp, account_id = cursor.fetchone()
+            cursor.execute("SELECT COUNT(*) FROM transactions_hourly_by_account")
+            hourly_rows = cursor.fetchone()[0]
+        connection.rollback()
+
+        # Los límites se alinean a buckets para que ambas consultas cubran las mismas filas
+        params = {
+            'account_id': account_id,
+            'since_7d': last_timestamp.replace(minute=0, second=0, microsecond=0) - timedelta(days=7),
+            'since_30d': last_timestamp.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=30),
+        }
+
+        errors = verify_rollups(connection, params)
+        for error in errors:
+            print(f"❌ {error}")
+
+        print(f"\n📊 Latencia de consultas (mediana de {args.repetitions}, "
+              f"{args.rows + 2 * batch_rows:,} transacciones, {hourly_rows:,} filas en transactions_hourly_by_account):")
+        print(f"   {'Consulta':<42} {'Cruda (ms)':>12} {'Rollup (ms)':>12} {'Mejora':>9}")
+        for name, raw_sql, rollup_sql in DASHBOARD_QUERIES:
+            raw_ms = time_query(connection, raw_sql, params, args.repetitions)
+            rollup_ms = time_query(connection, rollup_sql, params, args.repetitions)
+            print(f"   {name:<42} {raw_ms:>12.1f} {rollup_ms:>12.1f} {raw_ms / rollup_ms:>8.1f}x")
+
+        if errors:
+            sys.exit(1)
+    finally:
+        if not args.keep:
+            connection.rollback()
+            with connection:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+        connection.close()
+
+    print(f"\n✨ Benchmark completado")
+
+
+if __name__ == '__main__':
+    main()
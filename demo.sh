@@ -13,6 +13,9 @@ if [ -f .env ]; then
     set +a
 fi
 
+# Variante de schema (tópico de transacciones y flags del generador)
+source scripts/schema-variant.sh
+
 # Colores para output
 RED='\033[0;31m'
 GREEN='\033[0;32m'
@@ -167,7 +170,7 @@ run_demo() {
     echo ""
     
     if [ -f "generate_fraud_test_data.py" ]; then
-        python3 generate_fraud_test_data.py
+        python3 generate_fraud_test_data.py $GENERATOR_VARIANT_FLAGS
         echo ""
         print_success "Datos de prueba generados exitosamente"
     else
@@ -204,7 +207,7 @@ run_demo() {
     
     # Mensajes en Kafka
     print_info "Mensajes en Kafka Topics:"
-    show_statistics "trx-fraud-transactions" "Transacciones"
+    show_statistics "$TRANSACTIONS_TOPIC" "Transacciones"
     show_statistics "fraud-high-value" "Alertas de Alto Valor"
     show_statistics "fraud-unusual-time" "Alertas de Horario Inusual"
     echo ""
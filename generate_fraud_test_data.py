@@ -2,11 +2,14 @@
 """
 Generador de datos de prueba con casos específicos para cada regla de fraude
 """
+import argparse
 import csv
 from datetime import datetime, timedelta
 import random
 
-def generate_fraud_test_cases():
+from generate_test_data import CSV_FIELDNAMES, EPOCH_FIELDNAMES, build_time_fields
+
+def generate_fraud_test_cases(epoch_time=False):
     """Genera casos específicos para probar cada regla de fraude"""
     transactions = []
     base_time = datetime.now()
@@ -17,7 +20,7 @@ def generate_fraud_test_cases():
         {
             'transaction_id': 'FRAUD_HIGH_001',
             'account_id': 'ACC_FRAUD_001',
-            'timestamp': (base_time + timedelta(seconds=1)).strftime('%Y-%m-%d %H:%M:%S'),
+            **build_time_fields(base_time + timedelta(seconds=1), epoch_time),
             'amount': 15000.00,
             'merchant_name': 'Luxury Store',
             'transaction_type': 'PURCHASE',
@@ -29,7 +32,7 @@ def generate_fraud_test_cases():
         {
             'transaction_id': 'FRAUD_HIGH_002',
             'account_id': 'ACC_FRAUD_002',
-            'timestamp': (base_time + timedelta(seconds=2)).strftime('%Y-%m-%d %H:%M:%S'),
+            **build_time_fields(base_time + timedelta(seconds=2), epoch_time),
             'amount': 25000.50,
             'merchant_name': 'Electronics Superstore',
             'transaction_type': 'PURCHASE',
@@ -47,7 +50,7 @@ def generate_fraud_test_cases():
         transactions.append({
             'transaction_id': f'FRAUD_FREQ_{i:03d}',
             'account_id': account_freq,
-            'timestamp': (base_time + timedelta(seconds=10 + i*15)).strftime('%Y-%m-%d %H:%M:%S'),
+            **build_time_fields(base_time + timedelta(seconds=10 + i*15), epoch_time),
             'amount': random.uniform(50, 200),
             'merchant_name': f'Store {i%3}',
             'transaction_type': 'PURCHASE',
@@ -70,7 +73,7 @@ def generate_fraud_test_cases():
         transactions.append({
             'transaction_id': f'FRAUD_LOC_{i:03d}',
             'account_id': account_loc,
-            'timestamp': (base_time + timedelta(seconds=150 + i*60)).strftime('%Y-%m-%d %H:%M:%S'),
+            **build_time_fields(base_time + timedelta(seconds=150 + i*60), epoch_time),
             'amount': random.uniform(100, 500),
             'merchant_name': f'Store in City {i}',
             'transaction_type': 'PURCHASE',
@@ -87,7 +90,7 @@ def generate_fraud_test_cases():
         {
             'transaction_id': 'FRAUD_TIME_001',
             'account_id': 'ACC_TIME_001',
-            'timestamp': unusual_time.strftime('%Y-%m-%d %H:%M:%S'),
+            **build_time_fields(unusual_time, epoch_time),
             'amount': 1500.00,
             'merchant_name': '24h Gas Station',
             'transaction_type': 'PURCHASE',
@@ -99,7 +102,7 @@ def generate_fraud_test_cases():
         {
             'transaction_id': 'FRAUD_TIME_002',
             'account_id': 'ACC_TIME_002',
-            'timestamp': (unusual_time + timedelta(minutes=15)).strftime('%Y-%m-%d %H:%M:%S'),
+            **build_time_fields(unusual_time + timedelta(minutes=15), epoch_time),
             'amount': 2500.00,
             'merchant_name': 'Late Night Store',
             'transaction_type': 'PURCHASE',
@@ -116,7 +119,7 @@ def generate_fraud_test_cases():
         transactions.append({
             'transaction_id': f'TXN_NORMAL_{i:03d}',
             'account_id': f'ACC_NORMAL_{i%5:02d}',
-            'timestamp': (base_time + timedelta(seconds=300 + i*30)).strftime('%Y-%m-%d %H:%M:%S'),
+            **build_time_fields(base_time + timedelta(seconds=300 + i*30), epoch_time),
             'amount': random.uniform(10, 500),
             'merchant_name': random.choice(['Walmart', 'Target', 'Starbucks', 'Amazon', 'Gas Station']),
             'transaction_type': random.choice(['PURCHASE', 'WITHDRAWAL', 'PAYMENT']),
@@ -130,8 +133,9 @@ def generate_fraud_test_cases():
 
 def save_to_csv(transactions, filename):
     """Guarda las transacciones en un archivo CSV"""
-    fieldnames = ['transaction_id', 'account_id', 'timestamp', 'amount', 'merchant_name',
-                  'transaction_type', 'latitude', 'longitude', 'channel', 'status']
+    fieldnames = CSV_FIELDNAMES
+    if 'event_time_ms' in transactions[0]:
+        fieldnames = CSV_FIELDNAMES + EPOCH_FIELDNAMES
     
     with open(filename, 'w', newline='') as csvfile:
         writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
@@ -142,12 +146,20 @@ def save_to_csv(transactions, filename):
     print(f"Total de transacciones: {len(transactions)}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Generador de casos de prueba para reglas de fraude')
+    parser.add_argument(
+        '--epoch-time',
+        action='store_true',
+        help='Agregar columnas event_time_ms y hour_of_day (variante de schema epoch)'
+    )
+    args = parser.parse_args()
+    
     print("="*60)
     print("Generador de Datos de Prueba para Reglas de Fraude")
     print("="*60)
     print()
     
-    transactions = generate_fraud_test_cases()
+    transactions = generate_fraud_test_cases(epoch_time=args.epoch_time)
     filename = f"data/input/fraud_validation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
     save_to_csv(transactions, filename)
     
@@ -3,6 +3,7 @@
 Script de Generación de Datos de Prueba para Sistema de Detección de Fraude
 Genera transacciones financieras con patrones normales y fraudulentos
 Formato: transaction_id, account_id, timestamp, amount, merchant_name, transaction_type, latitude, longitude, channel, status
+Variante epoch (--epoch-time): agrega event_time_ms y hour_of_day como enteros
 """
 
 import argparse
@@ -53,11 +54,40 @@ CHANNELS = ['ATM', 'MOBILE', 'ONLINE', 'POS']
 
 STATUSES = ['APPROVED', 'PENDING', 'DECLINED']
 
+CSV_FIELDNAMES = ['transaction_id', 'account_id', 'timestamp', 'amount',
+                  'merchant_name', 'transaction_type', 'latitude', 'longitude',
+                  'channel', 'status']
+
+# Columnas adicionales de la variante de schema epoch
+EPOCH_FIELDNAMES = ['event_time_ms', 'hour_of_day']
+
+# Los timestamps se interpretan en UTC, igual que PARSE_TIMESTAMP en ksqlDB
+EPOCH = datetime(1970, 1, 1)
+ONE_SECOND = timedelta(seconds=1)
+
+
+def build_time_fields(timestamp: datetime, epoch_time: bool = False) -> Dict:
+    """
+    Construye los campos de tiempo de una transacción.
+    
+    isoformat() produce el mismo texto que strftime('%Y-%m-%d %H:%M:%S')
+    con una fracción del costo. Con epoch_time se agregan event_time_ms y
+    hour_of_day para que ksqlDB no tenga que parsear el string por evento;
+    event_time_ms se trunca a segundos para coincidir con el string.
+    """
+    fields = {'timestamp': timestamp.isoformat(sep=' ', timespec='seconds')}
+    if epoch_time:
+        fields['event_time_ms'] = (timestamp - EPOCH) // ONE_SECOND * 1000
+        fields['hour_of_day'] = timestamp.hour
+    return fields
+
+
 class TransactionGenerator:
     """Generador de transacciones financieras"""
     
-    def __init__(self, fraud_rate: float = 0.05):
+    def __init__(self, fraud_rate: float = 0.05, epoch_time: bool = False):
         self.fraud_rate = fraud_rate
+        self.epoch_time = epoch_time
         self.account_profiles = {}
         
     def generate_account_id(self, num_accounts: int = 100) -> str:
@@ -139,7 +169,7 @@ class TransactionGenerator:
         return {
             'transaction_id': self.generate_transaction_id(index),
             'account_id': account_id,
-            'timestamp': timestamp.strftime('%Y-%m-%d %H:%M:%S'),
+            **build_time_fields(timestamp, self.epoch_time),
             'amount': amount,
             'merchant_name': merchant,
             'transaction_type': random.choice(TRANSACTION_TYPES),
@@ -169,7 +199,7 @@ class TransactionGenerator:
         return {
             'transaction_id': self.generate_transaction_id(index, is_fraud=True),
             'account_id': account_id,
-            'timestamp': timestamp.strftime('%Y-%m-%d %H:%M:%S'),
+            **build_time_fields(timestamp, self.epoch_time),
             'amount': amount,
             'merchant_name': random.choice(['Best Buy', 'Home Depot', 'Amazon Web Services']),
             'transaction_type': 'PURCHASE',
@@ -202,7 +232,7 @@ class TransactionGenerator:
             transactions.append({
                 'transaction_id': self.generate_transaction_id(index + i, is_fraud=True),
                 'account_id': account_id,
-                'timestamp': timestamp.strftime('%Y-%m-%d %H:%M:%S'),
+                **build_time_fields(timestamp, self.epoch_time),
                 'amount': round(random.uniform(50, 1000), 2),
                 'merchant_name': random.choice(MERCHANTS),
                 'transaction_type': random.choice(TRANSACTION_TYPES),
@@ -237,7 +267,7 @@ class TransactionGenerator:
         transactions.append({
             'transaction_id': self.generate_transaction_id(index, is_fraud=True),
             'account_id': account_id,
-            'timestamp': base_timestamp.strftime('%Y-%m-%d %H:%M:%S'),
+            **build_time_fields(base_timestamp, self.epoch_time),
             'amount': round(random.uniform(100, 500), 2),
             'merchant_name': random.choice(MERCHANTS),
             'transaction_type': 'WITHDRAWAL',
@@ -257,7 +287,7 @@ class TransactionGenerator:
         transactions.append({
             'transaction_id': self.generate_transaction_id(index + 1, is_fraud=True),
             'account_id': account_id,
-            'timestamp': timestamp2.strftime('%Y-%m-%d %H:%M:%S'),
+            **build_time_fields(timestamp2, self.epoch_time),
             'amount': round(random.uniform(100, 500), 2),
             'merchant_name': random.choice(MERCHANTS),
             'transaction_type': 'WITHDRAWAL',
@@ -275,7 +305,7 @@ class TransactionGenerator:
         transactions.append({
             'transaction_id': self.generate_transaction_id(index + 2, is_fraud=True),
             'account_id': account_id,
-            'timestamp': timestamp3.strftime('%Y-%m-%d %H:%M:%S'),
+            **build_time_fields(timestamp3, self.epoch_time),
             'amount': round(random.uniform(100, 500), 2),
             'merchant_name': random.choice(MERCHANTS),
             'transaction_type': 'PURCHASE',
@@ -305,7 +335,7 @@ class TransactionGenerator:
         return {
             'transaction_id': self.generate_transaction_id(index, is_fraud=True),
             'account_id': account_id,
-            'timestamp': timestamp.strftime('%Y-%m-%d %H:%M:%S'),
+            **build_time_fields(timestamp, self.epoch_time),
             'amount': round(random.uniform(1000, 5000), 2),
             'merchant_name': random.choice(MERCHANTS),
             'transaction_type': random.choice(['PURCHASE', 'WITHDRAWAL']),
@@ -374,9 +404,9 @@ def save_to_csv(transactions: List[Dict], output_file: str):
         print("Error: No hay transacciones para guardar")
         return
     
-    fieldnames = ['transaction_id', 'account_id', 'timestamp', 'amount', 
-                  'merchant_name', 'transaction_type', 'latitude', 'longitude', 
-                  'channel', 'status']
+    fieldnames = CSV_FIELDNAMES
+    if 'event_time_ms' in transactions[0]:
+        fieldnames = CSV_FIELDNAMES + EPOCH_FIELDNAMES
     
     with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
         writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
@@ -449,6 +479,9 @@ Ejemplos de uso:
   # Ejemplo completo con timestamp
   python generate_test_data.py -t 10000 --fraud-rate 0.03 -o data/input/large_dataset.csv
   # Generará: data/input/large_dataset_20251019_143025.csv
+  
+  # Variante de schema epoch (SCHEMA_VARIANT=epoch)
+  python generate_test_data.py -t 10000 --epoch-time -o data/input/transactions.csv
         """
     )
     
@@ -479,6 +512,12 @@ Ejemplos de uso:
         help='No agregar timestamp al nombre del archivo'
     )
     
+    parser.add_argument(
+        '--epoch-time',
+        action='store_true',
+        help='Agregar columnas event_time_ms y hour_of_day (variante de schema epoch)'
+    )
+    
     args = parser.parse_args()
     
     # Validaciones
@@ -502,7 +541,7 @@ Ejemplos de uso:
     print(f"   Archivo de salida: {output_file}")
     print()
     
-    generator = TransactionGenerator(fraud_rate=args.fraud_rate)
+    generator = TransactionGenerator(fraud_rate=args.fraud_rate, epoch_time=args.epoch_time)
     transactions = generator.generate_transactions(args.transactions)
     
     # Guardar a CSV
@@ -520,6 +559,9 @@ Ejemplos de uso:
     print(f"  - longitude: Longitud de la ubicación")
     print(f"  - channel: Canal (ATM, MOBILE, ONLINE, POS)")
     print(f"  - status: Estado (APPROVED, PENDING, DECLINED)")
+    if args.epoch_time:
+        print(f"  - event_time_ms: Timestamp en milisegundos desde epoch (UTC)")
+        print(f"  - hour_of_day: Hora del día (0-23)")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,113 @@
+-- =====================================================
+-- KSQLDB: Creación de Streams Base (variante epoch)
+-- Sistema de Detección de Fraude en Transacciones
+-- =====================================================
+-- Reemplaza a 01-create-streams.sql cuando SCHEMA_VARIANT=epoch.
+-- Los eventos traen event_time_ms y hour_of_day como enteros, por lo que
+-- ninguna consulta necesita parsear el string timestamp por evento.
+--
+-- Este script también crea UNUSUAL_TIME_ALERTS y DAILY_PATTERNS usando
+-- las columnas enteras. Al ejecutarse antes que 02 y 03, sus versiones
+-- basadas en strings se omiten gracias a CREATE ... IF NOT EXISTS.
+--
+-- Las ventanas de 02 y 03 pasan a usar la hora del evento y no declaran
+-- GRACE PERIOD: eventos más de 24 horas anteriores a lo ya visto en la
+-- partición se descartan. Ver "Orden de los datos y eventos tardíos" en
+-- el README.
+-- =====================================================
+
+-- Configuración de sesión
+SET 'auto.offset.reset' = 'earliest';
+
+-- =====================================================
+-- STREAM: transactions_stream
+-- Stream principal que lee del tópico de transacciones epoch
+-- event_time_ms es la columna de tiempo: las ventanas usan la hora del evento
+-- =====================================================
+CREATE STREAM IF NOT EXISTS transactions_stream WITH (
+    KAFKA_TOPIC = 'trx-fraud-transactions-epoch',
+    VALUE_FORMAT = 'JSON_SR',
+    TIMESTAMP = 'event_time_ms'
+);
+
+-- =====================================================
+-- STREAM: transactions_stream_enriched
+-- Stream enriquecido; transaction_timestamp se obtiene sin parsear strings
+-- Con TIMESTAMP = 'event_time_ms', ROWTIME es la hora del evento, así que
+-- processing_time se toma del reloj de ksqlDB al procesar el registro
+-- =====================================================
+CREATE STREAM IF NOT EXISTS transactions_stream_enriched WITH (
+    KAFKA_TOPIC = 'transactions-enriched',
+    VALUE_FORMAT = 'JSON',
+    PARTITIONS = 3
+) AS SELECT
+    transaction_id,
+    account_id,
+    timestamp,
+    event_time_ms,
+    hour_of_day,
+    amount,
+    merchant_name,
+    transaction_type,
+    latitude,
+    longitude,
+    CONCAT(CAST(latitude AS STRING), ',', CAST(longitude AS STRING)) as location,
+    channel,
+    status,
+    FROM_UNIXTIME(event_time_ms) as transaction_timestamp,
+    TIMESTAMPTOSTRING(UNIX_TIMESTAMP(), 'yyyy-MM-dd HH:mm:ss') as processing_time
+FROM transactions_stream
+EMIT CHANGES;
+
+-- =====================================================
+-- REGLA 5: Transacciones en Horarios Inusuales
+-- Detecta transacciones en horarios poco comunes (2AM - 5AM)
+-- Misma salida que en 02-fraud-detection.sql, usando hour_of_day
+-- =====================================================
+CREATE STREAM IF NOT EXISTS unusual_time_alerts WITH (
+    KAFKA_TOPIC = 'fraud-unusual-time',
+    VALUE_FORMAT = 'JSON_SR',
+    PARTITIONS = 3
+) AS SELECT
+    transaction_id,
+    account_id,
+    amount,
+    timestamp,
+    merchant_name,
+    transaction_type,
+    latitude,
+    longitude,
+    channel,
+    CONCAT(CAST(latitude AS STRING), ',', CAST(longitude AS STRING)) as location,
+    hour_of_day,
+    'UNUSUAL_TIME' as fraud_type,
+    CONCAT('Transacción en horario inusual: ', LPAD(CAST(hour_of_day AS STRING), 2, '0'), ':00 hrs') as reason,
+    'LOW' as severity
+FROM transactions_stream
+WHERE hour_of_day >= 2
+  AND hour_of_day <= 5
+EMIT CHANGES;
+
+-- =====================================================
+-- TABLA 9: Patrones por día de la semana
+-- Misma salida que en 03-aggregations.sql, usando event_time_ms
+-- =====================================================
+CREATE TABLE IF NOT EXISTS daily_patterns WITH (
+    KAFKA_TOPIC = 'daily-patterns',
+    VALUE_FORMAT = 'JSON',
+    PARTITIONS = 3
+) AS SELECT
+    DAYOFWEEK(FROM_UNIXTIME(event_time_ms)) as day_of_week,
+    WINDOWSTART as window_start,
+    WINDOWEND as window_end,
+    COUNT(*) as transaction_count,
+    SUM(amount) as total_volume,
+    AVG(amount) as avg_amount,
+    COUNT_DISTINCT(account_id) as unique_accounts
+FROM transactions_stream
+WINDOW TUMBLING (SIZE 1 DAY)
+GROUP BY DAYOFWEEK(FROM_UNIXTIME(event_time_ms))
+EMIT CHANGES;
+
+-- Verificación del stream
+-- Para ejecutar manualmente: SELECT * FROM transactions_stream EMIT CHANGES LIMIT 5;
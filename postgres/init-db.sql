@@ -71,6 +71,85 @@ CREATE INDEX IF NOT EXISTS idx_fraud_alerts_transaction_id ON fraud_alerts(trans
 CREATE INDEX IF NOT EXISTS idx_fraud_alerts_fraud_type ON fraud_alerts(fraud_type);
 CREATE INDEX IF NOT EXISTS idx_fraud_alerts_severity ON fraud_alerts(severity);
 
+-- Índices para el refresco incremental de rollups (ver refresh_rollups.py)
+CREATE INDEX IF NOT EXISTS idx_transactions_created_at ON transactions(created_at);
+CREATE INDEX IF NOT EXISTS idx_fraud_alerts_alert_timestamp ON fraud_alerts(alert_timestamp);
+
+-- =====================================================
+-- ROLLUPS: agregados por hora y por día para dashboards
+-- Se refrescan con refresh_rollups.py a partir de un high-water mark
+-- (transactions.created_at / fraud_alerts.alert_timestamp).
+-- Las dimensiones NULL se agrupan como 'UNKNOWN'.
+-- =====================================================
+CREATE TABLE IF NOT EXISTS rollup_watermarks (
+    source_table VARCHAR(50) PRIMARY KEY,
+    high_water_mark TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS transactions_hourly_by_account (
+    bucket_start TIMESTAMP NOT NULL,
+    account_id VARCHAR(50) NOT NULL,
+    transaction_count BIGINT NOT NULL,
+    total_amount DECIMAL(18,2) NOT NULL,
+    min_amount DECIMAL(15,2) NOT NULL,
+    max_amount DECIMAL(15,2) NOT NULL,
+    PRIMARY KEY (bucket_start, account_id)
+);
+
+CREATE TABLE IF NOT EXISTS transactions_hourly_by_merchant (
+    bucket_start TIMESTAMP NOT NULL,
+    merchant_name VARCHAR(100) NOT NULL,
+    transaction_count BIGINT NOT NULL,
+    total_amount DECIMAL(18,2) NOT NULL,
+    min_amount DECIMAL(15,2) NOT NULL,
+    max_amount DECIMAL(15,2) NOT NULL,
+    PRIMARY KEY (bucket_start, merchant_name)
+);
+
+CREATE TABLE IF NOT EXISTS transactions_daily_by_account (
+    bucket_start TIMESTAMP NOT NULL,
+    account_id VARCHAR(50) NOT NULL,
+    transaction_count BIGINT NOT NULL,
+    total_amount DECIMAL(18,2) NOT NULL,
+    min_amount DECIMAL(15,2) NOT NULL,
+    max_amount DECIMAL(15,2) NOT NULL,
+    PRIMARY KEY (bucket_start, account_id)
+);
+
+CREATE TABLE IF NOT EXISTS transactions_daily_by_merchant (
+    bucket_start TIMESTAMP NOT NULL,
+    merchant_name VARCHAR(100) NOT NULL,
+    transaction_count BIGINT NOT NULL,
+    total_amount DECIMAL(18,2) NOT NULL,
+    min_amount DECIMAL(15,2) NOT NULL,
+    max_amount DECIMAL(15,2) NOT NULL,
+    PRIMARY KEY (bucket_start, merchant_name)
+);
+
+CREATE TABLE IF NOT EXISTS fraud_alerts_hourly_by_account (
+    bucket_start TIMESTAMP NOT NULL,
+    account_id VARCHAR(50) NOT NULL,
+    fraud_type VARCHAR(50) NOT NULL,
+    alert_count BIGINT NOT NULL,
+    total_amount DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY (bucket_start, account_id, fraud_type)
+);
+
+CREATE TABLE IF NOT EXISTS fraud_alerts_daily_by_account (
+    bucket_start TIMESTAMP NOT NULL,
+    account_id VARCHAR(50) NOT NULL,
+    fraud_type VARCHAR(50) NOT NULL,
+    alert_count BIGINT NOT NULL,
+    total_amount DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY (bucket_start, account_id, fraud_type)
+);
+
+-- Índices para consultas de dashboard por dimensión
+CREATE INDEX IF NOT EXISTS idx_transactions_hourly_by_account_account ON transactions_hourly_by_account(account_id, bucket_start);
+CREATE INDEX IF NOT EXISTS idx_transactions_hourly_by_merchant_merchant ON transactions_hourly_by_merchant(merchant_name, bucket_start);
+CREATE INDEX IF NOT EXISTS idx_fraud_alerts_hourly_by_account_account ON fraud_alerts_hourly_by_account(account_id, bucket_start);
+
 -- =====================================================
 -- GRANTS Y PERMISOS
 -- =====================================================
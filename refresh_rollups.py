@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Refresco Incremental de Rollups en PostgreSQL
+Mantiene agregados por hora y por día de transactions y fraud_alerts para dashboards
+
+Cada tabla fuente tiene un high-water mark en rollup_watermarks
+(transactions.created_at / fraud_alerts.alert_timestamp). En cada refresco:
+  1. Se buscan las filas nuevas desde el high-water mark (menos un margen para
+     filas que se confirmaron tarde) y se obtienen los buckets de hora afectados
+  2. Se re-agregan solo esos buckets desde la tabla fuente y se hace upsert
+  3. Los buckets diarios afectados se re-agregan desde los rollups por hora
+  4. Se avanza el high-water mark, todo en la misma transacción
+
+Re-agregar el bucket completo hace el refresco idempotente: una transacción
+con timestamp antiguo que llega tarde solo recalcula su hora y su día.
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import psycopg2
+except ImportError:
+    psycopg2 = None
+
+# Mismo archivo que cargan los scripts de bash (cp env.template .env)
+ENV_FILE = Path(__file__).parent / '.env'
+
+# Las dimensiones NULL se agrupan con este valor (las columnas de la PK son NOT NULL)
+UNKNOWN_DIMENSION = 'UNKNOWN'
+
+# Medidas: (columna, agregado sobre la fuente, re-agregado sobre el rollup por hora)
+TRANSACTION_MEASURES = [
+    ('transaction_count', 'COUNT(*)', 'SUM(transaction_count)'),
+    ('total_amount', 'SUM(amount)', 'SUM(total_amount)'),
+    ('min_amount', 'MIN(amount)', 'MIN(min_amount)'),
+    ('max_amount', 'MAX(amount)', 'MAX(max_amount)'),
+]
+
+FRAUD_ALERT_MEASURES = [
+    ('alert_count', 'COUNT(*)', 'SUM(alert_count)'),
+    ('total_amount', 'COALESCE(SUM(amount), 0)', 'SUM(total_amount)'),
+]
+
+# Tablas fuente y sus rollups (ver postgres/init-db.sql)
+ROLLUP_SOURCES = [
+    {
+        'source_table': 'transactions',
+        'watermark_column': 'created_at',
+        'time_column': 'timestamp',
+        'measures': TRANSACTION_MEASURES,
+        'rollups': [
+            {'hourly': 'transactions_hourly_by_account', 'daily': 'transactions_daily_by_account',
+             'dimensions': ['account_id']},
+            {'hourly': 'transactions_hourly_by_merchant', 'daily': 'transactions_daily_by_merchant',
+             'dimensions': ['merchant_name']},
+        ]
+    },
+    {
+        'source_table': 'fraud_alerts',
+        'watermark_column': 'alert_timestamp',
+        'time_column': 'alert_timestamp',
+        'measures': FRAUD_ALERT_MEASURES,
+        'rollups': [
+            {'hourly': 'fraud_alerts_hourly_by_account', 'daily': 'fraud_alerts_daily_by_account',
+             'dimensions': ['account_id', 'fraud_type']},
+        ]
+    },
+]
+
+
+def build_conflict_update(measure_columns: List[str]) -> str:
+    """
+    Construye el SET del upsert; solo reescribe las filas cuyas medidas cambiaron,
+    ya que un bucket re-agregado suele mantener la mayoría de sus filas intactas.
+    """
+    assignments = ', '.join(f'{column} = EXCLUDED.{column}' for column in measure_columns)
+    current = ', '.join(f'r.{column}' for column in measure_columns)
+    excluded = ', '.join(f'EXCLUDED.{column}' for column in measure_columns)
+    return f"{assignments}\n        WHERE ({current}) IS DISTINCT FROM ({excluded})"
+
+
+def build_hourly_upsert(source: Dict, rollup: Dict) -> str:
+    """Construye el upsert que re-agrega los buckets de hora afectados desde la fuente"""
+    dimensions = rollup['dimensions']
+    dimension_exprs = [f"COALESCE(s.{dim}, '{UNKNOWN_DIMENSION}')" for dim in dimensions]
+    measure_columns = [column for column, _, _ in source['measures']]
+    measure_exprs = [expr for _, expr, _ in source['measures']]
+    time_column = source['time_column']
+
+    return f"""
+        INSERT INTO {rollup['hourly']} AS r (bucket_start, {', '.join(dimensions)}, {', '.join(measure_columns)})
+        SELECT b.bucket_start, {', '.join(dimension_exprs)}, {', '.join(measure_exprs)}
+        FROM affected_hours b
+        JOIN {source['source_table']} s
+          ON s.{time_column} >= b.bucket_start
+         AND s.{time_column} < b.bucket_start + INTERVAL '1 hour'
+        GROUP BY b.bucket_start, {', '.join(dimension_exprs)}
+        ON CONFLICT (bucket_start, {', '.join(dimensions)}) DO UPDATE SET
+            {build_conflict_update(measure_columns)}
+    """
+
+
+def build_daily_upsert(source: Dict, rollup: Dict) -> str:
+    """Construye el upsert que re-agrega los buckets diarios afectados desde el rollup por hora"""
+    dimensions = rollup['dimensions']
+    measure_columns = [column for column, _, _ in source['measures']]
+    measure_exprs = [expr for _, _, expr in source['measures']]
+
+    return f"""
+        INSERT INTO {rollup['daily']} AS r (bucket_start, {', '.join(dimensions)}, {', '.join(measure_columns)})
+        SELECT d.bucket_start, {', '.join(f'h.{dim}' for dim in dimensions)}, {', '.join(measure_exprs)}
+        FROM affected_days d
+        JOIN {rollup['hourly']} h
+          ON h.bucket_start >= d.bucket_start
+         AND h.bucket_start < d.bucket_start + INTERVAL '1 day'
+        GROUP BY d.bucket_start, {', '.join(f'h.{dim}' for dim in dimensions)}
+        ON CONFLICT (bucket_start, {', '.join(dimensions)}) DO UPDATE SET
+            {build_conflict_update(measure_columns)}
+    """
+
+
+class RollupRefresher:
+    """Refresca los rollups de PostgreSQL a partir de los high-water marks"""
+
+    def __init__(self, connection, late_margin_seconds: int = 300):
+        self.connection = connection
+        self.late_margin = timedelta(seconds=late_margin_seconds)
+
+    def missing_tables(self) -> List[str]:
+        """Devuelve las tablas de rollups que no existen en la base (init-db.sql sin aplicar)"""
+        tables = ['rollup_watermarks'] + [rollup[grain] for source in ROLLUP_SOURCES
+                                          for rollup in source['rollups'] for grain in ('hourly', 'daily')]
+        with self.connection:
+            with self.connection.cursor() as cursor:
+                cursor.execute("SELECT name FROM unnest(%s) AS name WHERE to_regclass(name) IS NULL", (tables,))
+                return [row[0] for row in cursor.fetchall()]
+
+    def lock_watermark(self, cursor, source_table: str) -> Optional[datetime]:
+        """Obtiene y bloquea el high-water mark de una tabla fuente (None si nunca se refrescó)"""
+        cursor.execute(
+            "INSERT INTO rollup_watermarks (source_table) VALUES (%s) ON CONFLICT DO NOTHING",
+            (source_table,)
+        )
+        cursor.execute(
+            "SELECT high_water_mark FROM rollup_watermarks WHERE source_table = %s FOR UPDATE",
+            (source_table,)
+        )
+        return cursor.fetchone()[0]
+
+    def refresh_source(self, source: Dict) -> Dict:
+        """Refresca todos los rollups de una tabla fuente en una sola transacción"""
+        table = source['source_table']
+        watermark_column = source['watermark_column']
+        stats = {'source_table': table, 'affected_hours': 0, 'affected_days': 0, 'upserted_rows': 0}
+
+        with self.connection:
+            with self.connection.cursor() as cursor:
+                watermark = self.lock_watermark(cursor, table)
+                low = watermark - self.late_margin if watermark is not None else None
+
+                cursor.execute(
+                    f"SELECT MAX({watermark_column}) FROM {table} "
+                    f"WHERE {watermark_column} > COALESCE(%s, '-infinity'::timestamp)",
+                    (low,)
+                )
+                high = cursor.fetchone()[0]
+                if high is None:
+                    return stats
+
+                cursor.execute(
+                    f"""
+                    CREATE TEMP TABLE affected_hours ON COMMIT DROP AS
+                    SELECT DISTINCT date_trunc('hour', {source['time_column']}) AS bucket_start
+                    FROM {table}
+                    WHERE {watermark_column} > COALESCE(%s, '-infinity'::timestamp)
+                      AND {watermark_column} <= %s
+                      AND {source['time_column']} IS NOT NULL
+                    """,
+                    (low, high)
+                )
+                stats['affected_hours'] = cursor.rowcount
+                cursor.execute(
+                    "CREATE TEMP TABLE affected_days ON COMMIT DROP AS "
+                    "SELECT DISTINCT date_trunc('day', bucket_start) AS bucket_start FROM affected_hours"
+                )
+                stats['affected_days'] = cursor.rowcount
+                cursor.execute("ANALYZE affected_hours")
+                cursor.execute("ANALYZE affected_days")
+
+                for rollup in source['rollups']:
+                    cursor.execute(build_hourly_upsert(source, rollup))
+                    stats['upserted_rows'] += cursor.rowcount
+                    cursor.execute(build_daily_upsert(source, rollup))
+                    stats['upserted_rows'] += cursor.rowcount
+
+                cursor.execute(
+                    "UPDATE rollup_watermarks "
+                    "SET high_water_mark = GREATEST(high_water_mark, %s), updated_at = CURRENT_TIMESTAMP "
+                    "WHERE source_table = %s",
+                    (high, table)
+                )
+
+        return stats
+
+    def refresh(self) -> List[Dict]:
+        """Refresca los rollups de todas las tablas fuente"""
+        return [self.refresh_source(source) for source in ROLLUP_SOURCES]
+
+    def rebuild(self):
+        """Vacía los rollups y reinicia los high-water marks para recalcular todo"""
+        tables = [rollup[grain] for source in ROLLUP_SOURCES
+                  for rollup in source['rollups'] for grain in ('hourly', 'daily')]
+        with self.connection:
+            with self.connection.cursor() as cursor:
+                cursor.execute(f"TRUNCATE {', '.join(tables)}")
+                cursor.execute("DELETE FROM rollup_watermarks")
+
+
+def load_env_file(path: Path = ENV_FILE):
+    """Carga las variables KEY=VALUE de .env sin pisar las ya exportadas en el entorno"""
+    if not path.is_file():
+        return
+    for line in path.read_text(encoding='utf-8').splitlines():
+        line = line.strip()
+        if not line or line.startswith('#') or '=' not in line:
+            continue
+        key, value = line.split('=', 1)
+        os.environ.setdefault(key.strip(), value.strip().strip('"\''))
+
+
+def add_connection_arguments(parser: argparse.ArgumentParser):
+    """Agrega los argumentos de conexión a PostgreSQL (con valores por defecto desde el entorno y .env)"""
+    load_env_file()
+    parser.add_argument('--host', default=os.environ.get('POSTGRES_HOST', 'localhost'),
+                        help='Host de PostgreSQL (default: $POSTGRES_HOST o localhost)')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('POSTGRES_PORT', '5432')),
+                        help='Puerto de PostgreSQL (default: $POSTGRES_PORT o 5432)')
+    parser.add_argument('--dbname', default=os.environ.get('POSTGRES_DB', 'fraud_detection'),
+                        help='Base de datos (default: $POSTGRES_DB o fraud_detection)')
+    parser.add_argument('--user', default=os.environ.get('POSTGRES_USER', 'kafka_user'),
+                        help='Usuario (default: $POSTGRES_USER o kafka_user)')
+    parser.add_argument('--password', default=os.environ.get('POSTGRES_PASSWORD', 'kafka_pass'),
+                        help='Contraseña (default: $POSTGRES_PASSWORD o kafka_pass)')
+
+
+def require_psycopg2():
+    """Termina con un mensaje claro si falta psycopg2"""
+    if psycopg2 is None:
+        print("Error: Se requiere psycopg2 (pip install psycopg2-binary)")
+        sys.exit(1)
+
+
+def connect(args: argparse.Namespace):
+    """Abre una conexión a PostgreSQL; termina con un mensaje claro si falta psycopg2"""
+    require_psycopg2()
+    return psycopg2.connect(host=args.host, port=args.port, dbname=args.dbname,
+                            user=args.user, password=args.password)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Refresco incremental de rollups por hora y por día en PostgreSQL',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Ejemplos de uso:
+  # Refrescar una vez
+  python refresh_rollups.py
+
+  # Refrescar cada 60 segundos
+  python refresh_rollups.py --interval 60
+
+  # Recalcular todos los rollups desde cero
+  python refresh_rollups.py --rebuild
+        """
+    )
+
+    add_connection_arguments(parser)
+
+    parser.add_argument(
+        '-i', '--interval',
+        type=int,
+        default=0,
+        help='Segundos entre refrescos; 0 refresca una sola vez (default: 0)'
+    )
+
+    parser.add_argument(
+        '--late-margin',
+        type=int,
+        default=300,
+        help='Segundos antes del high-water mark que se vuelven a revisar por filas confirmadas tarde (default: 300)'
+    )
+
+    parser.add_argument(
+        '--rebuild',
+        action='store_true',
+        help='Vaciar los rollups y reiniciar los high-water marks antes de refrescar'
+    )
+
+    args = parser.parse_args()
+
+    # Validaciones
+    if args.interval < 0 or args.late_margin < 0:
+        print("Error: --interval y --late-margin deben ser mayores o iguales a 0")
+        sys.exit(1)
+
+    require_psycopg2()
+    connection = None
+    refresher = RollupRefresher(connection, late_margin_seconds=args.late_margin)
+    rebuild_pending = args.rebuild
+
+    try:
+        while True:
+            try:
+                # Conectar al inicio o tras un error que cerró la conexión (p. ej. PostgreSQL
+                # todavía arrancando con docker-compose up, o un reinicio)
+                if connection is None or connection.closed:
+                    if connection is not None:
+                        print("Reconectando a PostgreSQL...")
+                    connection = connect(args)
+                    refresher.connection = connection
+
+                    # postgres/init-db.sql solo corre al crear el volumen; en despliegues
+                    # existentes hay que aplicarlo a mano para crear los rollups
+                    missing = refresher.missing_tables()
+                    if missing:
+                        print(f"Error: Faltan tablas de rollups en {args.dbname}: {', '.join(missing)}")
+                        print("Aplica postgres/init-db.sql (es idempotente):")
+                        print("  docker exec -i fraud-postgres psql -U kafka_user -d fraud_detection "
+                              "< postgres/init-db.sql")
+                        sys.exit(1)
+
+                if rebuild_pending:
+                    print("Reiniciando rollups y high-water marks...")
+                    refresher.rebuild()
+                    rebuild_pending = False
+
+                start = time.perf_counter()
+                results = refresher.refresh()
+                elapsed = time.perf_counter() - start
+
+                for stats in results:
+                    print(f"  {stats['source_table']}: {stats['affected_hours']} horas, "
+                          f"{stats['affected_days']} días, {stats['upserted_rows']} filas actualizadas")
+                print(f"✅ Refresco completado en {elapsed:.2f} s")
+            except psycopg2.Error as e:
+                # Cada refresco es una transacción: tras un error no queda nada a medias
+                print(f"❌ Error en el refresco: {e}".rstrip())
+                if args.interval == 0:
+                    sys.exit(1)
+                print(f"   Se reintentará en {args.interval} s")
+
+            if args.interval == 0:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("\nRefresco interrumpido por el usuario")
+    finally:
+        if connection is not None:
+            connection.close()
+
+if __name__ == '__main__':
+    main()
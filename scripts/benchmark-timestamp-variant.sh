@@ -0,0 +1,260 @@
+#!/bin/bash
+# =====================================================
+# Script: benchmark-timestamp-variant.sh
+# Compara el throughput de la variante de schema string contra la epoch
+# (event_time_ms / hour_of_day) en el generador y en ksqlDB
+# Uso: ./benchmark-timestamp-variant.sh [num-transacciones]
+# =====================================================
+
+set -e
+
+# Cargar variables de entorno desde el directorio raíz del proyecto
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PROJECT_ROOT="$(dirname "$SCRIPT_DIR")"
+
+if [ -f "$PROJECT_ROOT/.env" ]; then
+    set -a
+    source "$PROJECT_ROOT/.env"
+    set +a
+fi
+
+# Colores para output
+RED='\033[0;31m'
+GREEN='\033[0;32m'
+YELLOW='\033[1;33m'
+BLUE='\033[0;34m'
+NC='\033[0m' # No Color
+
+# Configuración (con valores por defecto)
+KSQL_URL="${KSQLDB_SERVER_URL:-http://localhost:8088}"
+NUM_TRANSACTIONS="${1:-2000000}"
+BENCH_TIMEOUT="${BENCH_TIMEOUT:-600}"
+WORK_DIR="$(mktemp -d)"
+
+# Resultados de ksqlDB por consulta (para la tabla final)
+declare -A KSQL_EVENTS KSQL_ELAPSED
+
+# Función para imprimir mensajes con color
+print_info() {
+    echo -e "${BLUE}  $1${NC}"
+}
+
+print_success() {
+    echo -e "${GREEN} $1${NC}"
+}
+
+print_warning() {
+    echo -e "${YELLOW}  $1${NC}"
+}
+
+print_error() {
+    echo -e "${RED} $1${NC}"
+}
+
+# Tiempo actual en milisegundos
+now_ms() {
+    echo $(( $(date +%s%N) / 1000000 ))
+}
+
+# Función para ejecutar un statement de ksqlDB leyendo desde earliest
+run_ksql() {
+    local statement=$1
+    local payload=$(python3 -c 'import json, sys; print(json.dumps({"ksql": sys.argv[1], "streamsProperties": {"ksql.streams.auto.offset.reset": "earliest"}}))' "$statement")
+    curl -sf -X POST "$KSQL_URL/ksql" \
+        -H "Content-Type: application/vnd.ksql.v1+json" \
+        -d "$payload" > /dev/null
+}
+
+# Función para contar mensajes en un tópico
+count_topic_messages() {
+    local topic=$1
+    local count=$(docker exec fraud-kafka kafka-run-class kafka.tools.GetOffsetShell \
+        --broker-list localhost:9092 \
+        --topic "$topic" \
+        --time -1 2>/dev/null | \
+        awk -F ':' '{sum += $3} END {print sum}')
+    echo ${count:-0}
+}
+
+# Función para eliminar los objetos de benchmark
+cleanup() {
+    for variant in string epoch; do
+        run_ksql "DROP STREAM IF EXISTS bench_ts_${variant}_out DELETE TOPIC;" || true
+        run_ksql "DROP STREAM IF EXISTS bench_ts_${variant}_base DELETE TOPIC;" || true
+        run_ksql "DROP STREAM IF EXISTS bench_ts_${variant}_src DELETE TOPIC;" || true
+    done
+    rm -rf "$WORK_DIR"
+}
+
+# Función para medir el generador en una variante
+benchmark_generator() {
+    local variant=$1
+    local output="$WORK_DIR/$variant.csv"
+    local flags="--no-timestamp"
+    if [ "$variant" = "epoch" ]; then
+        flags="$flags --epoch-time"
+    fi
+
+    local start=$(now_ms)
+    python3 "$PROJECT_ROOT/generate_test_data.py" -t "$NUM_TRANSACTIONS" -o "$output" $flags > /dev/null
+    local elapsed=$(( $(now_ms) - start ))
+
+    local rows=$(( $(wc -l < "$output") - 1 ))
+    echo "  generador  $variant: $rows transacciones en ${elapsed} ms ($(( rows * 1000 / (elapsed + 1) )) tx/s)"
+}
+
+# Función para cargar un CSV como JSON en el tópico fuente de benchmark
+load_source_topic() {
+    local variant=$1
+    local topic="bench-ts-$variant-src"
+
+    docker exec fraud-kafka kafka-topics --create \
+        --bootstrap-server localhost:9092 \
+        --topic "$topic" \
+        --partitions 3 \
+        --replication-factor 1 \
+        --if-not-exists > /dev/null 2>&1
+
+    python3 -c '
+import csv, json, sys
+for row in csv.DictReader(open(sys.argv[1])):
+    for field in ("amount", "latitude", "longitude"):
+        row[field] = float(row[field])
+    for field in ("event_time_ms", "hour_of_day"):
+        if field in row:
+            row[field] = int(row[field])
+    print(json.dumps(row))
+' "$WORK_DIR/$variant.csv" | \
+        docker exec -i fraud-kafka kafka-console-producer \
+            --bootstrap-server localhost:9092 \
+            --topic "$topic" > /dev/null
+}
+
+# Función para esperar a que un tópico de salida alcance una cantidad de mensajes
+wait_for_topic_count() {
+    local topic=$1
+    local target=$2
+    local deadline=$3
+    local processed=0
+    while [ "$processed" -lt "$target" ]; do
+        if [ "$(now_ms)" -gt "$deadline" ]; then
+            print_error "Timeout esperando $topic ($processed/$target)" >&2
+            return 1
+        fi
+        sleep 0.2
+        processed=$(count_topic_messages "$topic")
+    done
+    echo "$processed"
+}
+
+# Función para medir una consulta de ksqlDB hasta procesar todo el tópico fuente
+# El reloj arranca con el primer offset de salida, así que el arranque de la
+# consulta no se cuenta; el polling agrega como mucho un intervalo por extremo
+benchmark_ksql_query() {
+    local label=$1
+    local variant=$2
+    local out_topic=$3
+    local statement=$4
+    local expected=$(( $(wc -l < "$WORK_DIR/$variant.csv") - 1 ))
+    local deadline=$(( $(now_ms) + BENCH_TIMEOUT * 1000 ))
+
+    run_ksql "$statement"
+
+    local first
+    first=$(wait_for_topic_count "$out_topic" 1 "$deadline")
+    local start=$(now_ms)
+    wait_for_topic_count "$out_topic" "$expected" "$deadline" > /dev/null
+    local elapsed=$(( $(now_ms) - start ))
+    local events=$(( expected - first ))
+
+    KSQL_EVENTS[$label]=$events
+    KSQL_ELAPSED[$label]=$elapsed
+
+    echo "  ksqlDB     $label: $events eventos en ${elapsed} ms ($(( events * 1000 / (elapsed + 1) )) ev/s)"
+}
+
+trap cleanup EXIT
+
+# Banner
+echo ""
+echo "=========================================="
+echo "  Benchmark: timestamp string vs epoch"
+echo "=========================================="
+echo ""
+
+print_info "Transacciones por variante: $NUM_TRANSACTIONS"
+echo ""
+
+# Generador
+print_info "Midiendo el generador..."
+benchmark_generator string
+benchmark_generator epoch
+echo ""
+
+# ksqlDB
+if ! curl -sf "$KSQL_URL/info" > /dev/null 2>&1; then
+    print_warning "ksqlDB no está disponible en $KSQL_URL, se omite el benchmark de consultas"
+    exit 0
+fi
+
+print_info "Cargando tópicos fuente de benchmark..."
+source_columns="transaction_id VARCHAR, account_id VARCHAR, timestamp VARCHAR, amount DOUBLE, merchant_name VARCHAR, transaction_type VARCHAR, latitude DOUBLE, longitude DOUBLE, channel VARCHAR, status VARCHAR"
+load_source_topic string
+load_source_topic epoch
+run_ksql "CREATE STREAM IF NOT EXISTS bench_ts_string_src ($source_columns) WITH (KAFKA_TOPIC = 'bench-ts-string-src', VALUE_FORMAT = 'JSON');"
+run_ksql "CREATE STREAM IF NOT EXISTS bench_ts_epoch_src ($source_columns, event_time_ms BIGINT, hour_of_day INTEGER) WITH (KAFKA_TOPIC = 'bench-ts-epoch-src', VALUE_FORMAT = 'JSON', TIMESTAMP = 'event_time_ms');"
+print_success "Tópicos fuente cargados"
+echo ""
+
+# Consultas pass-through: leen y escriben lo mismo sin funciones de timestamp;
+# su tiempo es la línea base que se resta a cada variante
+print_info "Midiendo consultas de ksqlDB..."
+benchmark_ksql_query string-base string bench-ts-string-base "CREATE STREAM bench_ts_string_base WITH (KAFKA_TOPIC = 'bench-ts-string-base', VALUE_FORMAT = 'JSON', PARTITIONS = 3) AS SELECT
+    transaction_id,
+    timestamp
+FROM bench_ts_string_src EMIT CHANGES;"
+benchmark_ksql_query epoch-base epoch bench-ts-epoch-base "CREATE STREAM bench_ts_epoch_base WITH (KAFKA_TOPIC = 'bench-ts-epoch-base', VALUE_FORMAT = 'JSON', PARTITIONS = 3) AS SELECT
+    transaction_id,
+    event_time_ms,
+    hour_of_day
+FROM bench_ts_epoch_src EMIT CHANGES;"
+
+# Ambas consultas calculan lo que transactions_stream_enriched,
+# unusual_time_alerts y daily_patterns necesitan del timestamp por evento
+benchmark_ksql_query string string bench-ts-string-out "CREATE STREAM bench_ts_string_out WITH (KAFKA_TOPIC = 'bench-ts-string-out', VALUE_FORMAT = 'JSON', PARTITIONS = 3) AS SELECT
+    transaction_id,
+    PARSE_TIMESTAMP(timestamp, 'yyyy-MM-dd HH:mm:ss') AS transaction_timestamp,
+    CAST(SUBSTRING(timestamp, 12, 2) AS INTEGER) AS hour_of_day,
+    CAST(SUBSTRING(timestamp, 12, 2) AS INTEGER) >= 2 AND CAST(SUBSTRING(timestamp, 12, 2) AS INTEGER) <= 5 AS unusual_time,
+    DAYOFWEEK(PARSE_TIMESTAMP(timestamp, 'yyyy-MM-dd HH:mm:ss')) AS day_of_week
+FROM bench_ts_string_src EMIT CHANGES;"
+benchmark_ksql_query epoch epoch bench-ts-epoch-out "CREATE STREAM bench_ts_epoch_out WITH (KAFKA_TOPIC = 'bench-ts-epoch-out', VALUE_FORMAT = 'JSON', PARTITIONS = 3) AS SELECT
+    transaction_id,
+    FROM_UNIXTIME(event_time_ms) AS transaction_timestamp,
+    hour_of_day,
+    hour_of_day >= 2 AND hour_of_day <= 5 AS unusual_time,
+    DAYOFWEEK(FROM_UNIXTIME(event_time_ms)) AS day_of_week
+FROM bench_ts_epoch_src EMIT CHANGES;"
+echo ""
+
+# Tabla lista para la sección de rendimiento del README
+print_info "Resultados de ksqlDB (formato README):"
+echo ""
+echo "| Variante | Eventos | Pass-through | Con timestamp | Throughput | Costo de timestamp |"
+echo "|----------|---------|--------------|---------------|------------|--------------------|"
+for variant in string epoch; do
+    events=${KSQL_EVENTS[$variant]}
+    elapsed=${KSQL_ELAPSED[$variant]}
+    base_events=${KSQL_EVENTS[$variant-base]}
+    base_elapsed=${KSQL_ELAPSED[$variant-base]}
+    # Nanosegundos por evento de cada consulta; la diferencia es el costo del timestamp
+    ns_per_event=$(( elapsed * 1000000 / events ))
+    base_ns_per_event=$(( base_elapsed * 1000000 / base_events ))
+    echo "| $variant | $events | ${base_elapsed} ms | ${elapsed} ms | ~$(( events * 1000 / (elapsed + 1) )) ev/s | $(( ns_per_event - base_ns_per_event )) ns/evento |"
+done
+echo ""
+
+print_success "Benchmark completado"
+echo ""
+
+exit 0
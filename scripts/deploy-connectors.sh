@@ -29,6 +29,18 @@ CONNECT_URL="${KAFKA_CONNECT_URL:-http://localhost:8083}"
 MAX_RETRIES="${MAX_RETRIES:-30}"
 RETRY_INTERVAL="${RETRY_INTERVAL:-2}"
 
+# Variante de schema (tópico de transacciones y flags del generador)
+source "$SCRIPT_DIR/schema-variant.sh"
+
+# Variante de schema: "epoch" usa los conectores con event_time_ms y hour_of_day
+if [ "$SCHEMA_VARIANT" = "epoch" ]; then
+    CSV_SOURCE_FILE="connectors/csv-source-epoch-connector.json"
+    POSTGRES_SINK_FILE="connectors/postgres-sink-epoch-connector.json"
+else
+    CSV_SOURCE_FILE="connectors/csv-source-connector.json"
+    POSTGRES_SINK_FILE="connectors/postgres-sink-connector.json"
+fi
+
 # Función para imprimir mensajes con color
 print_info() {
     echo -e "${BLUE}  $1${NC}"
@@ -151,11 +163,13 @@ echo ""
 # Esperar a que Kafka Connect esté listo
 wait_for_connect || exit 1
 
+echo ""
+print_info "Variante de schema: $SCHEMA_VARIANT"
 echo ""
 
 # Desplegar CSV Source Connector
-if [ -f "connectors/csv-source-connector.json" ]; then
-    deploy_connector "connectors/csv-source-connector.json" "csv-source-connector"
+if [ -f "$CSV_SOURCE_FILE" ]; then
+    deploy_connector "$CSV_SOURCE_FILE" "csv-source-connector"
     sleep 8
     check_connector_status "csv-source-connector"
     
@@ -165,14 +179,14 @@ if [ -f "connectors/csv-source-connector.json" ]; then
         print_info "El conector está esperando archivos CSV. Se reiniciará automáticamente cuando detecte archivos."
     fi
 else
-    print_error "Archivo no encontrado: connectors/csv-source-connector.json"
+    print_error "Archivo no encontrado: $CSV_SOURCE_FILE"
 fi
 
 echo ""
 
 # Desplegar PostgreSQL Sink Connector
-if [ -f "connectors/postgres-sink-connector.json" ]; then
-    deploy_connector "connectors/postgres-sink-connector.json" "postgres-sink-connector"
+if [ -f "$POSTGRES_SINK_FILE" ]; then
+    deploy_connector "$POSTGRES_SINK_FILE" "postgres-sink-connector"
     sleep 8
     check_connector_status "postgres-sink-connector"
     
@@ -185,7 +199,7 @@ if [ -f "connectors/postgres-sink-connector.json" ]; then
         print_warning "Sink Connector puede no estar usando schemas correctamente"
     fi
 else
-    print_error "Archivo no encontrado: connectors/postgres-sink-connector.json"
+    print_error "Archivo no encontrado: $POSTGRES_SINK_FILE"
 fi
 
 echo ""
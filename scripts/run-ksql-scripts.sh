@@ -29,6 +29,16 @@ KSQL_URL="${KSQLDB_SERVER_URL:-http://localhost:8088}"
 MAX_RETRIES="${MAX_RETRIES:-30}"
 RETRY_INTERVAL="${RETRY_INTERVAL:-2}"
 
+# Variante de schema (tópico de transacciones y flags del generador)
+source "$SCRIPT_DIR/schema-variant.sh"
+
+# Variante de schema: "epoch" crea los streams base sobre event_time_ms y hour_of_day
+if [ "$SCHEMA_VARIANT" = "epoch" ]; then
+    CREATE_STREAMS_FILE="ksqldb/01-create-streams-epoch.sql"
+else
+    CREATE_STREAMS_FILE="ksqldb/01-create-streams.sql"
+fi
+
 # Función para imprimir mensajes con color
 print_info() {
     echo -e "${BLUE}  $1${NC}"
@@ -200,14 +210,14 @@ wait_for_ksql || exit 1
 echo ""
 
 # Ejecutar scripts en orden
-print_info "Ejecutando scripts de ksqlDB en orden..."
+print_info "Ejecutando scripts de ksqlDB en orden (variante de schema: $SCHEMA_VARIANT)..."
 echo ""
 
-if [ -f "ksqldb/01-create-streams.sql" ]; then
-    run_ksql_file_docker "ksqldb/01-create-streams.sql"
+if [ -f "$CREATE_STREAMS_FILE" ]; then
+    run_ksql_file_docker "$CREATE_STREAMS_FILE"
     sleep 3
 else
-    print_error "Archivo no encontrado: ksqldb/01-create-streams.sql"
+    print_error "Archivo no encontrado: $CREATE_STREAMS_FILE"
 fi
 
 echo ""
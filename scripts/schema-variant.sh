@@ -0,0 +1,23 @@
+#!/bin/bash
+# =====================================================
+# Script: schema-variant.sh
+# Resuelve la configuración que depende de SCHEMA_VARIANT
+# Uso: source "$PROJECT_ROOT/scripts/schema-variant.sh" (después de cargar .env)
+#
+# Define:
+#   SCHEMA_VARIANT           string (default) o epoch
+#   TRANSACTIONS_TOPIC       tópico donde el CSV Source publica las transacciones
+#   GENERATOR_VARIANT_FLAGS  flags para generate_test_data.py / generate_fraud_test_data.py
+# =====================================================
+
+SCHEMA_VARIANT="${SCHEMA_VARIANT:-string}"
+
+# Variante de schema epoch: las transacciones van a su propio tópico y el
+# CSV debe incluir event_time_ms y hour_of_day (obligatorios en el conector)
+if [ "$SCHEMA_VARIANT" = "epoch" ]; then
+    TRANSACTIONS_TOPIC="${TRANSACTIONS_EPOCH_TOPIC:-trx-fraud-transactions-epoch}"
+    GENERATOR_VARIANT_FLAGS="--epoch-time"
+else
+    TRANSACTIONS_TOPIC="${TRANSACTIONS_TOPIC:-trx-fraud-transactions}"
+    GENERATOR_VARIANT_FLAGS=""
+fi
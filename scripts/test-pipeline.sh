@@ -27,6 +27,9 @@ NUM_TRANSACTIONS="${1:-50}"
 FRAUD_RATE="${2:-0.10}"
 TEST_FILE="data/input/test_pipeline_$(date +%Y%m%d_%H%M%S).csv"
 
+# Variante de schema (tópico de transacciones y flags del generador)
+source "$SCRIPT_DIR/schema-variant.sh"
+
 # Funciones
 print_banner() {
     echo -e "${CYAN}"
@@ -64,7 +67,7 @@ echo ""
 
 # Paso 1: Generar datos de prueba
 print_info "Paso 1: Generando datos de prueba..."
-if python3 "$PROJECT_ROOT/generate_test_data.py" -t "$NUM_TRANSACTIONS" --fraud-rate "$FRAUD_RATE" -o "$PROJECT_ROOT/$TEST_FILE" > /dev/null 2>&1; then
+if python3 "$PROJECT_ROOT/generate_test_data.py" -t "$NUM_TRANSACTIONS" --fraud-rate "$FRAUD_RATE" -o "$PROJECT_ROOT/$TEST_FILE" $GENERATOR_VARIANT_FLAGS > /dev/null 2>&1; then
     print_success "Datos generados: $TEST_FILE"
 else
     print_error "Error al generar datos"
@@ -109,11 +112,11 @@ print_info "Paso 4: Verificando mensajes en Kafka..."
 sleep 3
 transactions_count=$(docker exec fraud-kafka kafka-run-class kafka.tools.GetOffsetShell \
     --broker-list localhost:9092 \
-    --topic trx-fraud-transactions \
+    --topic "$TRANSACTIONS_TOPIC" \
     --time -1 2>/dev/null | \
     awk -F ':' '{sum += $3} END {print sum}')
 
-echo "    Total de mensajes en trx-fraud-transactions: $transactions_count"
+echo "    Total de mensajes en $TRANSACTIONS_TOPIC: $transactions_count"
 
 if [ "$transactions_count" -gt 0 ]; then
     print_success "Transacciones publicadas en Kafka"
@@ -123,7 +126,7 @@ if [ "$transactions_count" -gt 0 ]; then
     print_info "Muestra de transacción (con schema):"
     docker exec fraud-kafka kafka-console-consumer \
         --bootstrap-server localhost:9092 \
-        --topic trx-fraud-transactions \
+        --topic "$TRANSACTIONS_TOPIC" \
         --from-beginning \
         --max-messages 1 \
         --timeout-ms 3000 2>/dev/null | \
@@ -134,7 +137,7 @@ if [ "$transactions_count" -gt 0 ]; then
     print_info "Verificando schema en el mensaje..."
     has_schema=$(docker exec fraud-kafka kafka-console-consumer \
         --bootstrap-server localhost:9092 \
-        --topic trx-fraud-transactions \
+        --topic "$TRANSACTIONS_TOPIC" \
         --from-beginning \
         --max-messages 1 \
         --timeout-ms 3000 2>/dev/null | \
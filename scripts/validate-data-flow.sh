@@ -25,7 +25,9 @@ NC='\033[0m'
 # Configuración
 CONNECT_URL="${KAFKA_CONNECT_URL:-http://localhost:8083}"
 KSQL_URL="${KSQLDB_SERVER_URL:-http://localhost:8088}"
-TRANSACTIONS_TOPIC="${TRANSACTIONS_TOPIC:-trx-fraud-transactions}"
+
+# Variante de schema (tópico de transacciones y flags del generador)
+source "$SCRIPT_DIR/schema-variant.sh"
 
 # Funciones de impresión
 print_banner() {
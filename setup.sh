@@ -28,7 +28,8 @@ NC='\033[0m' # No Color
 
 # Configuración (con valores por defecto si no están en .env)
 KAFKA_BROKER="${KAFKA_BROKER:-localhost:9092}"
-TRANSACTIONS_TOPIC="${TRANSACTIONS_TOPIC:-trx-fraud-transactions}"
+# Variante de schema (tópico de transacciones y flags del generador)
+source scripts/schema-variant.sh
 FRAUD_ALERTS_TOPIC="${FRAUD_ALERTS_TOPIC:-fraud-alerts}"
 # Topics de detección de fraude
 FRAUD_HIGH_VALUE_TOPIC="${FRAUD_HIGH_VALUE_TOPIC:-fraud-high-value}"
@@ -208,13 +209,13 @@ show_useful_commands() {
     echo "  docker exec kafka kafka-topics --bootstrap-server localhost:9092 --list"
     echo ""
     echo "  # Consumir mensajes de un tópico:"
-    echo "  docker exec kafka kafka-console-consumer --bootstrap-server localhost:9092 --topic trx-fraud-transactions --from-beginning"
+    echo "  docker exec kafka kafka-console-consumer --bootstrap-server localhost:9092 --topic $TRANSACTIONS_TOPIC --from-beginning"
     echo ""
     echo "  # Verificar conectores:"
     echo "  curl http://localhost:8083/connectors"
     echo ""
     echo "  # Generar más datos de prueba:"
-    echo "  python3 generate_test_data.py --transactions 5000 --fraud-rate 0.08 --output data/input/transactions_002.csv"
+    echo "  python3 generate_test_data.py --transactions 5000 --fraud-rate 0.08 --output data/input/transactions_002.csv $GENERATOR_VARIANT_FLAGS"
     echo ""
 }
 
@@ -235,8 +236,15 @@ start_docker_services() {
 register_schemas() {
     print_step "Registrando schemas en Schema Registry..."
     
-    if [ -f "scripts/register-schema.sh" ] && [ -f "schemas/transaction-value-schema.json" ]; then
-        if ./scripts/register-schema.sh schemas/transaction-value-schema.json trx-fraud-transactions-value; then
+    # Variante de schema: "epoch" registra el schema con event_time_ms y hour_of_day
+    local schema_file="schemas/transaction-value-schema.json"
+    local subject="$TRANSACTIONS_TOPIC-value"
+    if [ "$SCHEMA_VARIANT" = "epoch" ]; then
+        schema_file="schemas/transaction-epoch-value-schema.json"
+    fi
+    
+    if [ -f "scripts/register-schema.sh" ] && [ -f "$schema_file" ]; then
+        if ./scripts/register-schema.sh "$schema_file" "$subject"; then
             print_success "Schema registrado correctamente"
             return 0
         else